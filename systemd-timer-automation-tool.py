@@ -1,11 +1,20 @@
 #!/usr/bin/env python3
 import argparse
+import functools
 import os
+import re
+import shlex
 import sys
-import subprocess
-import shutil
-import stat
-import getpass
+
+# shutil and subprocess are imported lazily inside the functions that
+# need them: trivial invocations (--help, --configs paths, dry runs)
+# then skip their import cost, which matters when systemd fires this
+# script on a timer.
+#
+# All subprocess.run calls pass close_fds=False: the default True makes
+# Popen walk and close the whole fd range per spawn (measurably slower),
+# and this script keeps no sensitive file descriptors open around the
+# commands it launches (systemctl, journalctl, $EDITOR, task scripts).
 
 # References:
 # * https://chatgpt.com/share/67ccb427-f7d8-8007-8248-eb5ac5a78b04
@@ -62,61 +71,169 @@ import getpass
 # The script should handle these tasks to make systemd user-level timer
 # usage convenient.
 
+@functools.lru_cache(maxsize=4)
 def detect_os(selected_os: str = "auto") -> str:
     """
     Detect operating system by reading /etc/os-release if selected_os='auto'.
     Otherwise return the forced string if it's 'arch' or 'ubuntu'.
+    Cached so repeated calls don't re-read /etc/os-release.
     """
     if selected_os in ["arch", "ubuntu"]:
         return selected_os
 
-    # If selected_os is 'auto', we try to parse /etc/os-release
+    # If selected_os is 'auto', we look for the ID= line in
+    # /etc/os-release. mmap lets the kernel page cache back the search
+    # directly and bytes.find needs no lowercasing: ID= values are
+    # lowercase per the spec (quoting is optional, so both forms are
+    # probed). Matches are only accepted at the start of a line so
+    # e.g. VERSION_ID= cannot alias.
+    import mmap
     try:
-        with open("/etc/os-release", "r", encoding="utf-8") as f:
-            content = f.read().lower()
-            if "arch linux" in content:
-                return "arch"
-            elif "ubuntu" in content:
-                return "ubuntu"
-            else:
-                return "unknown"
-    except FileNotFoundError:
+        fd = os.open("/etc/os-release", os.O_RDONLY)
+    except OSError:
+        return "unknown"
+    try:
+        mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+    except ValueError:  # empty file
         return "unknown"
+    finally:
+        os.close(fd)
+    with mm:
+        size = len(mm)
+        for name, needles in [
+            ("arch", (b"ID=arch", b'ID="arch"')),
+            ("ubuntu", (b"ID=ubuntu", b'ID="ubuntu"')),
+        ]:
+            for needle in needles:
+                idx = mm.find(needle)
+                while idx != -1:
+                    end = idx + len(needle)
+                    # anchored to a full line: preceded by start-of-file
+                    # or \n, followed by end-of-file or a line ending
+                    if ((idx == 0 or mm[idx - 1] == 0x0A)
+                            and (end == size or mm[end] in (0x0A, 0x0D))):
+                        return name
+                    idx = mm.find(needle, idx + 1)
+    return "unknown"
+
+
+# Shell metacharacters that force command-mode runs through /bin/sh.
+_SHELL_META = re.compile(r'[|&;<>$`*?()]')
+
+# Computed once: expanduser can hit the password database, and several
+# functions need these same paths.
+SYSTEMD_USER_DIR = os.path.join(os.path.expanduser("~"),
+                                ".config", "systemd", "user")
+SERVICE_FILE = os.path.join(SYSTEMD_USER_DIR, "daily_by_hostname.service")
+TIMER_FILE = os.path.join(SYSTEMD_USER_DIR, "daily_by_hostname.timer")
+
+
+def is_executable_file(path) -> bool:
+    """
+    Check if path (a str or an os.DirEntry) is a file we may execute.
+    os.access(X_OK) is a single faccessat syscall and, unlike the old
+    S_IXUSR bitmask, also honours group/other exec bits and ACLs.
+    """
+    if hasattr(path, "stat"):
+        # os.DirEntry from os.scandir: the file check is already cached
+        return path.is_file(follow_symlinks=True) and os.access(path.path, os.X_OK)
+    return os.path.isfile(path) and os.access(path, os.X_OK)
 
 
-def is_executable_file(path: str) -> bool:
-    """Check if path is a file and is marked executable."""
-    if not os.path.isfile(path):
-        return False
-    st = os.stat(path)
-    return bool(st.st_mode & stat.S_IXUSR)
+def _shebang_interp(path: str):
+    """
+    Return the argv list from path's shebang line (e.g. ['/usr/bin/env',
+    'python3']), or None if the file has no usable shebang.
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return None
+    try:
+        head = os.read(fd, 128)
+    finally:
+        os.close(fd)
+    if not head.startswith(b"#!"):
+        return None
+    if b"\n" not in head:
+        # shebang line longer than our read window: the parsed argv
+        # would be truncated, so don't trust it
+        return None
+    line = head[2:].split(b"\n", 1)[0].rstrip(b"\r")
+    try:
+        interp = line.decode("utf-8").split()
+    except UnicodeDecodeError:
+        return None
+    return interp or None
 
 
 def run_commands(args, run_arg: str, is_dry_run: bool) -> None:
     """
     Identify if run_arg is a folder or a file or other,
     then run or dry-run items accordingly.
+
+    subprocess is imported per spawning branch so that dry runs never
+    pay its import cost.
     """
     if os.path.isdir(run_arg):
-        # Run all scripts in folder if folder
-        for item in sorted(os.listdir(run_arg)):
-            full_path = os.path.join(run_arg, item)
-            if os.path.isfile(full_path) and is_executable_file(full_path):
+        # Run all scripts in folder if folder.
+        # os.scandir caches stat info per entry, avoiding the extra
+        # stat syscalls that os.listdir + os.path.isfile would cost.
+        with os.scandir(run_arg) as it:
+            entries = list(it)
+        jobs = getattr(args, "jobs", 1) or 1
+        # Sorting N entries is O(N log N) for an ordering nobody sees
+        # when the user opts out or when concurrent jobs interleave the
+        # runs anyway; default stays sorted for sequential runs.
+        if not getattr(args, "unordered", False) and jobs <= 1:
+            entries.sort(key=lambda e: e.name)
+        paths = []
+        # Dry-run output is batched into one writelines call at the end:
+        # per-line print on a line-buffered terminal means a lock grab
+        # and flush per entry, which adds up on folders with thousands
+        # of scripts. Real runs keep print so output interleaves with
+        # the children's.
+        out = []
+        # DirEntry caches is_file(); os.access is one faccessat syscall
+        # and honours group/other exec bits and ACLs, unlike S_IXUSR.
+        for entry in entries:
+            if entry.is_file() and os.access(entry.path, os.X_OK):
                 if args.verbose:
-                    print(f"Found executable script: {full_path}")
+                    if is_dry_run:
+                        out.append(f"Found executable script: {entry.path}\n")
+                    else:
+                        print(f"Found executable script: {entry.path}")
                 if is_dry_run:
-                    print(f"[DRYRUN] Would run: '{full_path}'")
+                    out.append(f"[DRYRUN] Would run: '{entry.path}'\n")
                 else:
-                    print(f"Running: '{full_path}'")
-                    subprocess.run([full_path], check=False)
+                    paths.append(entry.path)
+        if out:
+            sys.stdout.writelines(out)
+        if not paths:
+            return
+        import subprocess
+        if jobs > 1 and len(paths) > 1:
+            # Tasks are independent, so overlap fork/exec and child
+            # runtime instead of blocking on each script in turn.
+            import concurrent.futures
+            with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as ex:
+                def _run_one(p):
+                    print(f"Running: '{p}'")
+                    subprocess.run([p], check=False, close_fds=False)
+                list(ex.map(_run_one, paths))
+        else:
+            for p in paths:
+                print(f"Running: '{p}'")
+                subprocess.run([p], check=False, close_fds=False)
     elif os.path.isfile(run_arg):
         # If it's a file, run that script
         if is_executable_file(run_arg):
             if is_dry_run:
                 print(f"[DRYRUN] Would run file: '{run_arg}'")
             else:
+                import subprocess
                 print(f"Running file: '{run_arg}'")
-                subprocess.run([run_arg], check=False)
+                subprocess.run([run_arg], check=False, close_fds=False)
         else:
             if args.verbose:
                 print(f"'{run_arg}' is a file but probably not executable. "
@@ -124,13 +241,63 @@ def run_commands(args, run_arg: str, is_dry_run: bool) -> None:
             if is_dry_run:
                 print(f"[DRYRUN] Would run via shell: '{run_arg}'")
             else:
-                subprocess.run(["bash", run_arg], check=False)
+                import subprocess
+                # Honour the file's own shebang when it has one: this
+                # runs the right interpreter directly instead of always
+                # wrapping (and mis-running non-shell scripts) in bash.
+                interp = _shebang_interp(run_arg)
+                if interp:
+                    try:
+                        subprocess.run(interp + [run_arg], check=False,
+                                       close_fds=False)
+                    except FileNotFoundError:
+                        # interpreter missing: degrade to the bash
+                        # wrapper like the pre-shebang behavior did
+                        subprocess.run(["bash", run_arg], check=False,
+                                       close_fds=False)
+                else:
+                    subprocess.run(["bash", run_arg], check=False,
+                                   close_fds=False)
     else:
         # If unknown, treat as command
         if is_dry_run:
             print(f"[DRYRUN] Would run command: {run_arg}")
         else:
-            subprocess.run(run_arg, shell=True, check=False)
+            import subprocess
+            # shell=True forks an extra /bin/sh per invocation; only pay
+            # for it when the command actually uses shell syntax.
+            if _SHELL_META.search(run_arg):
+                subprocess.run(run_arg, shell=True, check=False, close_fds=False)
+            else:
+                try:
+                    argv = shlex.split(run_arg)
+                except ValueError:
+                    argv = None
+                if argv:
+                    try:
+                        subprocess.run(argv, check=False, close_fds=False)
+                    except FileNotFoundError:
+                        # match the shell's graceful handling of missing
+                        # commands; check=False means we must not crash
+                        print(f"{argv[0]}: command not found")
+                else:
+                    subprocess.run(run_arg, shell=True, check=False, close_fds=False)
+
+
+# Commands this tool relies on; shared by check and suggest below.
+REQUIRED_COMMANDS = ["systemctl", "bash", "nano"]
+
+# shutil.which walks $PATH and stats candidates on every call;
+# cache results so repeated lookups for the same command are free.
+@functools.lru_cache(maxsize=None)
+def _which(cmd):
+    import shutil
+    return shutil.which(cmd)
+
+
+def _scan_deps() -> dict:
+    """Return {command: resolved_path_or_None} for REQUIRED_COMMANDS."""
+    return {cmd: _which(cmd) for cmd in REQUIRED_COMMANDS}
 
 
 def check_dependencies(verbose: bool) -> None:
@@ -138,9 +305,7 @@ def check_dependencies(verbose: bool) -> None:
     Check presence of certain commands (like systemctl, bash, etc.).
     For demonstration, let's check systemctl, bash, and nano or vi.
     """
-    commands_to_check = ["systemctl", "bash", "nano"]
-    for cmd in commands_to_check:
-        cmd_path = shutil.which(cmd)
+    for cmd, cmd_path in _scan_deps().items():
         if cmd_path:
             print(f"[OK]   {cmd} found at {cmd_path}")
         else:
@@ -156,10 +321,7 @@ def suggest_install_script(verbose: bool) -> None:
     if on ubuntu, we suggest apt-get, otherwise print generic message.
     """
     user_os = detect_os("auto")
-    missing_cmds = []
-    for cmd in ["systemctl", "bash", "nano"]:
-        if not shutil.which(cmd):
-            missing_cmds.append(cmd)
+    missing_cmds = [cmd for cmd, path in _scan_deps().items() if not path]
 
     if not missing_cmds:
         print("All essential commands appear to be installed.")
@@ -180,63 +342,96 @@ def suggest_install_script(verbose: bool) -> None:
         print("Suggested install script generation completed.")
 
 
+def _write_unit_file(name: str, chunks, dir_fd: int) -> None:
+    """
+    Write a tuple of pre-encoded bytes chunks to name atomically
+    (tmp file + rename), skipping the write entirely if the file
+    already holds identical content so that repeated '--configs create'
+    runs cause no disk churn.
+
+    name is opened relative to dir_fd (openat semantics): the systemd
+    user directory is resolved once by the caller instead of the kernel
+    walking the full path again for every open/rename. The chunks go
+    out in one scatter-gather writev syscall where available.
+    """
+    size = sum(len(c) for c in chunks)
+    try:
+        fd = os.open(name, os.O_RDONLY, dir_fd=dir_fd)
+    except OSError:
+        pass
+    else:
+        try:
+            if os.read(fd, size + 1) == b"".join(chunks):
+                return
+        finally:
+            os.close(fd)
+    tmp = name + ".tmp"
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644,
+                 dir_fd=dir_fd)
+    try:
+        if hasattr(os, "writev"):
+            os.writev(fd, chunks)
+        else:
+            for chunk in chunks:
+                os.write(fd, chunk)
+    finally:
+        os.close(fd)
+    os.replace(tmp, name, src_dir_fd=dir_fd, dst_dir_fd=dir_fd)
+
+
 def create_service_and_timer(args):
     """
     Create service and timer files in ~/.config/systemd/user/
     using the provided run_arg, OnCalendar, etc.
     """
-    home = os.path.expanduser("~")
-    systemd_user_dir = os.path.join(
-        home, ".config", "systemd", "user"
-    )
-    os.makedirs(systemd_user_dir, exist_ok=True)
+    os.makedirs(SYSTEMD_USER_DIR, exist_ok=True)
 
     script_path = os.path.abspath(__file__)
     default_description = f"Daily User Run of {script_path}"
     description = args.Description if args.Description else default_description
     on_calendar = args.OnCalendar if args.OnCalendar else "*-*-* 14:00:00"
 
-    service_file = os.path.join(systemd_user_dir, "daily_by_hostname.service")
-    timer_file = os.path.join(systemd_user_dir, "daily_by_hostname.timer")
-
-    # Build service content
-    service_content = [
-        "[Unit]",
-        f"Description={description}",
-        "After=network.target",
-        "",
-        "[Service]",
-        "Type=oneshot",
-        f"ExecStart=/usr/bin/env python3 {script_path} --run \"{args.run_arg}\"",
-        "",
-        "# End of service file\n"
-    ]
+    # Build service content: constant sections stay as bytes literals,
+    # variable lines are encoded once, and the tuple goes to writev.
+    service_chunks = (
+        b"[Unit]\n",
+        f"Description={description}\n".encode(),
+        b"After=network.target\n"
+        b"\n"
+        b"[Service]\n"
+        b"Type=oneshot\n",
+        f'ExecStart=/usr/bin/env python3 {script_path} --run "{args.run_arg}"\n'.encode(),
+        b"\n"
+        b"# End of service file\n",
+    )
     # Build timer content
     persistent_value = "true" if args.Persistent is None else args.Persistent
     if persistent_value not in ["true", "false"]:
         persistent_value = "true"
-    timer_content = [
-        "[Unit]",
-        f"Description=Timer for: {description}",
-        "",
-        "[Timer]",
-        f"OnCalendar={on_calendar}",
-        f"Persistent={persistent_value}",
-        "",
-        "[Install]",
-        "WantedBy=default.target",
-        "",
-        "# End of timer file\n"
-    ]
-
-    # Write them
-    with open(service_file, "w", encoding="utf-8") as sf:
-        sf.write("\n".join(service_content))
-    with open(timer_file, "w", encoding="utf-8") as tf:
-        tf.write("\n".join(timer_content))
-
-    print(f"Created service file: {service_file}")
-    print(f"Created timer file:   {timer_file}")
+    timer_chunks = (
+        b"[Unit]\n",
+        f"Description=Timer for: {description}\n".encode(),
+        b"\n"
+        b"[Timer]\n",
+        f"OnCalendar={on_calendar}\n"
+        f"Persistent={persistent_value}\n".encode(),
+        b"\n"
+        b"[Install]\n"
+        b"WantedBy=default.target\n"
+        b"\n"
+        b"# End of timer file\n",
+    )
+
+    # Write them through one directory fd (openat-style)
+    dir_fd = os.open(SYSTEMD_USER_DIR, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        _write_unit_file("daily_by_hostname.service", service_chunks, dir_fd)
+        _write_unit_file("daily_by_hostname.timer", timer_chunks, dir_fd)
+    finally:
+        os.close(dir_fd)
+
+    print(f"Created service file: {SERVICE_FILE}")
+    print(f"Created timer file:   {TIMER_FILE}")
     print("You can now enable and start the timer with:")
     print("  $ systemctl --user enable daily_by_hostname.timer")
     print("  $ systemctl --user start daily_by_hostname.timer")
@@ -246,47 +441,54 @@ def restart_systemd_timer():
     """
     Reload systemd daemon and restart the timer.
     """
+    import subprocess
     print("Reloading systemd daemon...")
-    subprocess.run(["systemctl", "--user", "daemon-reload"], check=False)
+    subprocess.run(["systemctl", "--user", "daemon-reload"], check=False, close_fds=False)
     
     print("Restarting timer...")
-    subprocess.run(["systemctl", "--user", "restart", "daily_by_hostname.timer"], check=False)
+    subprocess.run(["systemctl", "--user", "restart", "daily_by_hostname.timer"], check=False, close_fds=False)
     
     print("Timer restarted successfully.")
 
+def _resolve_editor() -> str:
+    """Return $EDITOR or a fallback (nano, vi), or '' if none found."""
+    editor = os.environ.get("EDITOR", "")
+    if not editor:
+        for candidate in ["nano", "vi"]:
+            if _which(candidate):
+                editor = candidate
+                break
+    return editor
+
+
 def edit_file_in_editor(file_path: str, restart_after_edit=True):
     """
     Open the given file in $EDITOR or fallback to nano, vi.
     Optionally restart the systemd timer after editing.
+
+    When nothing needs to happen after the editor exits, the process is
+    handed over via os.execvp (no return): this skips the fork+waitpid
+    pair that subprocess.run would cost just to idle behind the editor.
     """
-    editor = os.environ.get("EDITOR", "")
+    editor = _resolve_editor()
     if not editor:
-        # fallback
-        for candidate in ["nano", "vi"]:
-            if shutil.which(candidate):
-                editor = candidate
-                break
-        if not editor:
-            print("No suitable editor found! Please set $EDITOR.")
-            return
-    subprocess.run([editor, file_path], check=False)
-    
-    if restart_after_edit:
-        restart_systemd_timer()
+        print("No suitable editor found! Please set $EDITOR.")
+        return
+    if not restart_after_edit:
+        os.execvp(editor, [editor, file_path])  # does not return
+
+    import subprocess
+    subprocess.run([editor, file_path], check=False, close_fds=False)
+    restart_systemd_timer()
 
 
 def handle_configs(args):
     """
     Manage creation, editing, or deletion of service/timer files.
     """
-    home = os.path.expanduser("~")
-    systemd_user_dir = os.path.join(home, ".config", "systemd", "user")
-    service_file = os.path.join(systemd_user_dir, "daily_by_hostname.service")
-    timer_file = os.path.join(systemd_user_dir, "daily_by_hostname.timer")
-
     if args.configs == "paths":
-        print(f"{service_file}")
-        print(f"{timer_file}")
+        print(f"{SERVICE_FILE}")
+        print(f"{TIMER_FILE}")
         return
     elif args.configs == "create":
         if not args.run_arg:
@@ -296,25 +498,50 @@ def handle_configs(args):
         if not args.no_restart:
             restart_systemd_timer()
 
+    elif args.configs == "create-and-enable":
+        if not args.run_arg:
+            print("Error: --configs create-and-enable requires --run-arg")
+            sys.exit(1)
+        create_service_and_timer(args)
+        # One daemon-reload, then enable --now does enable+start in a
+        # single systemctl invocation instead of separate calls.
+        import subprocess
+        subprocess.run(["systemctl", "--user", "daemon-reload"],
+                       check=False, close_fds=False)
+        subprocess.run(["systemctl", "--user", "enable", "--now",
+                        "daily_by_hostname.timer"],
+                       check=False, close_fds=False)
+
     elif args.configs == "edit-service":
-        if not os.path.exists(service_file):
-            print(f"Service file not found: {service_file}")
+        if not os.path.exists(SERVICE_FILE):
+            print(f"Service file not found: {SERVICE_FILE}")
             return
-        edit_file_in_editor(service_file, not args.no_restart)
+        edit_file_in_editor(SERVICE_FILE, not args.no_restart)
 
     elif args.configs == "edit-timer":
-        if not os.path.exists(timer_file):
-            print(f"Timer file not found: {timer_file}")
+        if not os.path.exists(TIMER_FILE):
+            print(f"Timer file not found: {TIMER_FILE}")
             return
-        edit_file_in_editor(timer_file, not args.no_restart)
+        edit_file_in_editor(TIMER_FILE, not args.no_restart)
 
     elif args.configs == "delete":
-        if os.path.exists(service_file):
-            os.remove(service_file)
-            print(f"Deleted service file: {service_file}")
-        if os.path.exists(timer_file):
-            os.remove(timer_file)
-            print(f"Deleted timer file: {timer_file}")
+        try:
+            dir_fd = os.open(SYSTEMD_USER_DIR, os.O_RDONLY | os.O_DIRECTORY)
+        except FileNotFoundError:
+            return
+        try:
+            for name, full_path, label in [
+                ("daily_by_hostname.service", SERVICE_FILE, "service"),
+                ("daily_by_hostname.timer", TIMER_FILE, "timer"),
+            ]:
+                try:
+                    os.unlink(name, dir_fd=dir_fd)
+                except FileNotFoundError:
+                    pass
+                else:
+                    print(f"Deleted {label} file: {full_path}")
+        finally:
+            os.close(dir_fd)
 
 
 def handle_systemd_install(args):
@@ -345,11 +572,28 @@ def handle_systemd_timer_actions(args):
         return
         
     if user_cmd:
+        import subprocess
         print(f"Running: {' '.join(user_cmd)}")
-        subprocess.run(user_cmd, check=False)
+        subprocess.run(user_cmd, check=False, close_fds=False)
+
+
+# Single-flag invocations that can skip argparse entirely (see main).
+_FAST_ACTIONS = ("--status", "--logs", "--enable_and_start",
+                 "--disable_and_stop", "--restart")
 
 
 def main():
+    # Fast path: the systemd-action flags take no other arguments, so
+    # dispatch them directly with a stub namespace instead of paying
+    # for construction of the full ~15-option parser on every call.
+    if len(sys.argv) == 2 and sys.argv[1] in _FAST_ACTIONS:
+        stub = argparse.Namespace(status=False, enable_and_start=False,
+                                  disable_and_stop=False, logs=False,
+                                  restart=False, since=None)
+        setattr(stub, sys.argv[1].lstrip("-"), True)
+        handle_systemd_timer_actions(stub)
+        sys.exit(0)
+
     parser = argparse.ArgumentParser(
         description="Daily script by hostname that can be run by systemd timer."
     )
@@ -365,10 +609,16 @@ def main():
     parser.add_argument("-v", "--verbose", action="store_true",
                         help="Enable verbose output")
 
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="Run up to N folder scripts concurrently (default 1 = sequential)")
+
+    parser.add_argument("--unordered", action="store_true",
+                        help="Skip sorting folder scripts by name (implied by --jobs > 1)")
+
     parser.add_argument("--dependencies", choices=["check", "script"],
                         help="Manage or show required dependencies")
 
-    parser.add_argument("--configs", choices=["create", "paths", "edit-timer", "edit-service", "delete"],
+    parser.add_argument("--configs", choices=["create", "create-and-enable", "paths", "edit-timer", "edit-service", "delete"],
                         help="Create, edit or delete systemd service/timer files")
 
     parser.add_argument("--run-arg", default=None,